@@ -14,3 +14,6 @@ class NotificationsConfig(AppConfig):
         # Register notification channels
         from .channels import register_channels
         register_channels()
+
+        # Connect template cache invalidation signals
+        from . import signals  # noqa: F401
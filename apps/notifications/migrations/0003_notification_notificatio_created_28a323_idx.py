@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-08-30 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_remove_sms_push_preferences'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['created_at', 'status'], name='notificatio_created_28a323_idx'),
+        ),
+    ]
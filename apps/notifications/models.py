@@ -83,6 +83,8 @@ class Notification(models.Model):
             models.Index(fields=['status', 'scheduled_at']),
             models.Index(fields=['customer', 'created_at']),
             models.Index(fields=['template', 'status']),
+            # Serves the windowed per-status delivery statistics
+            models.Index(fields=['created_at', 'status']),
         ]
     
     def __str__(self):
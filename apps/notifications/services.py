@@ -2,7 +2,10 @@
 Notification services for the notification system.
 """
 import logging
+import time
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
+from django.core.cache import cache
 from django.template import Template, Context
 from django.utils import timezone
 from .models import Notification, NotificationTemplate, NotificationLog
@@ -10,6 +13,61 @@ from .channels import NotificationChannelFactory
 
 logger = logging.getLogger(__name__)
 
+TEMPLATE_VERSION_CACHE_KEY = 'notification_template_version'
+
+
+def _template_version() -> int:
+    """Current template version from the shared cache.
+
+    The NotificationTemplate signals bump this on every write, so lru
+    entries keyed on it go stale in every process at once - including
+    Celery workers that never see the write. Seeded from the clock so a
+    re-seed after eviction can never collide with an older version. An
+    unreachable cache degrades to per-process caching (version 0).
+    """
+    try:
+        return cache.get_or_set(
+            TEMPLATE_VERSION_CACHE_KEY, lambda: int(time.time()), timeout=None
+        )
+    except Exception:
+        return 0
+
+
+def _bump_template_version():
+    """Invalidate cached templates in all processes after a write."""
+    try:
+        cache.incr(TEMPLATE_VERSION_CACHE_KEY)
+    except ValueError:
+        # Key missing (never seeded or evicted); re-seed monotonically
+        cache.set(TEMPLATE_VERSION_CACHE_KEY, int(time.time()), timeout=None)
+
+
+@lru_cache(maxsize=256)
+def _get_active_template(name: str, version: int) -> Optional[NotificationTemplate]:
+    """Fetch an active template by name, cached per process.
+
+    Templates change rarely but are resolved on every notification.
+    Callers pass _template_version() as the second key so a template
+    write anywhere (API, management command, TemplateService) is picked
+    up by every web and worker process without a restart.
+    """
+    try:
+        return NotificationTemplate.objects.get(name=name, is_active=True)
+    except NotificationTemplate.DoesNotExist:
+        return None
+
+
+@lru_cache(maxsize=512)
+def _compile_template(template_string: str) -> Template:
+    """Compile a template string once per process.
+
+    Parsing dominates the cost of rendering these short notification
+    templates; keying on the source text means an edited template simply
+    compiles fresh, so no explicit invalidation is needed. Compiled Django
+    templates are safe to render concurrently.
+    """
+    return Template(template_string)
+
 
 class NotificationService:
     """Service class for handling notification operations."""
@@ -30,9 +88,8 @@ class NotificationService:
         """
         Create a new notification.
         """
-        try:
-            template = NotificationTemplate.objects.get(name=template_name, is_active=True)
-        except NotificationTemplate.DoesNotExist:
+        template = _get_active_template(template_name, _template_version())
+        if template is None:
             logger.error(f"Notification template '{template_name}' not found")
             return None
         
@@ -100,30 +157,44 @@ class NotificationService:
         priority: str = 'normal'
     ) -> List[Notification]:
         """
-        Create and send multiple notifications.
+        Create multiple notifications with a single bulk INSERT.
         """
+        template = _get_active_template(template_name, _template_version())
+        if template is None:
+            logger.error(f"Notification template '{template_name}' not found")
+            return []
+
+        channel = self.channel_factory.create_channel(template.channel)
+        if not channel:
+            logger.error(f"Channel '{template.channel}' not available")
+            return []
+
+        scheduled_at = timezone.now()
         notifications = []
-        
+
         for recipient_data in recipients:
             recipient = recipient_data.get('recipient')
-            customer = recipient_data.get('customer')
-            order = recipient_data.get('order')
-            
+            if not channel.validate_recipient(recipient):
+                logger.error(f"Invalid recipient '{recipient}' for channel '{template.channel}'")
+                continue
+
             # Merge global context with recipient-specific context
             merged_context = {**(context or {}), **recipient_data.get('context', {})}
-            
-            notification = self.create_notification(
-                template_name=template_name,
+
+            notifications.append(Notification(
+                template=template,
                 recipient=recipient,
-                customer=customer,
-                order=order,
-                context=merged_context,
-                priority=priority
-            )
-            
-            if notification:
-                notifications.append(notification)
-        
+                subject=self._render_template(template.subject_template, merged_context),
+                message=self._render_template(template.body_template, merged_context),
+                priority=priority,
+                scheduled_at=scheduled_at,
+                customer=recipient_data.get('customer'),
+                order=recipient_data.get('order'),
+                context_data=merged_context
+            ))
+
+        Notification.objects.bulk_create(notifications, batch_size=500)
+        logger.info(f"Created {len(notifications)} notifications from template '{template_name}'")
         return notifications
     
     def _render_template(self, template_string: str, context_data: Dict[str, Any]) -> str:
@@ -134,7 +205,7 @@ class NotificationService:
             return ""
         
         try:
-            template = Template(template_string)
+            template = _compile_template(template_string)
             context = Context(context_data)
             return template.render(context)
         except Exception as e:
@@ -192,16 +263,14 @@ class TemplateService:
             subject_template=subject_template,
             body_template=body_template
         )
+        _get_active_template.cache_clear()
         logger.info(f"Created notification template: {name}")
         return template
-    
+
     @staticmethod
     def get_template(name: str) -> Optional[NotificationTemplate]:
         """Get a notification template by name."""
-        try:
-            return NotificationTemplate.objects.get(name=name, is_active=True)
-        except NotificationTemplate.DoesNotExist:
-            return None
+        return _get_active_template(name, _template_version())
     
     @staticmethod
     def update_template(
@@ -217,6 +286,7 @@ class TemplateService:
             if body_template is not None:
                 template.body_template = body_template
             template.save()
+            _get_active_template.cache_clear()
             logger.info(f"Updated notification template: {name}")
             return True
         except NotificationTemplate.DoesNotExist:
@@ -0,0 +1,36 @@
+"""
+Signal handlers for the notification system.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import NotificationTemplate
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_TEMPLATE_NAMES_CACHE_KEY = 'active_template_names'
+
+
+@receiver([post_save, post_delete], sender=NotificationTemplate)
+def invalidate_template_caches(sender, **kwargs):
+    """Drop cached template data whenever a template row changes.
+
+    The version bump invalidates the template lru_cache in every web and
+    worker process; the cache_clear only reaches this process but takes
+    effect even when the shared cache is down.
+    """
+    from .services import _bump_template_version, _get_active_template
+
+    try:
+        cache.delete(ACTIVE_TEMPLATE_NAMES_CACHE_KEY)
+        _bump_template_version()
+    except Exception as e:
+        # An unreachable cache must not fail the template write; the name
+        # list still expires via its TTL and the local clear below covers
+        # this process
+        logger.warning(f"Could not invalidate template caches: {e}")
+
+    _get_active_template.cache_clear()
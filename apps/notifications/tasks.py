@@ -244,3 +244,32 @@ def send_order_update_notification(order_id, old_status, new_status):
     except Exception as e:
         logger.error(f"Failed to send order update notification for order {order_id}: {str(e)}")
         return False
+
+
+@shared_task
+def send_order_confirmation_notification(order_id):
+    """
+    Celery task to send the confirmation for a newly created order.
+
+    Thin wrapper over send_order_update_notification; the order views
+    publish this by name when an order is created.
+    """
+    try:
+        from apps.orders.models import Order
+        new_status = Order.objects.values_list('status', flat=True).get(id=order_id)
+    except Exception as e:
+        logger.error(f"Failed to send order confirmation for order {order_id}: {str(e)}")
+        return False
+    return send_order_update_notification(order_id, 'created', new_status)
+
+
+@shared_task
+def send_order_status_notification(order_id, new_status):
+    """
+    Celery task to send a status-change notification when only the new
+    status is known at the call site (e.g. cancellation).
+
+    Thin wrapper over send_order_update_notification; the order views
+    publish this by name after the status UPDATE commits.
+    """
+    return send_order_update_notification(order_id, 'updated', new_status)
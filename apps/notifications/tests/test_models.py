@@ -4,7 +4,7 @@ Tests for notification models and services.
 from django.test import TestCase
 from django.utils import timezone
 from apps.notifications.models import NotificationTemplate, Notification
-from apps.notifications.services import NotificationService
+from apps.notifications.services import NotificationService, _get_active_template
 from apps.customers.models import Customer
 from apps.orders.models import Order
 from decimal import Decimal
@@ -38,6 +38,10 @@ class NotificationServiceTest(TestCase):
     
     def setUp(self):
         """Set up test data."""
+        # Templates created per-test must not be served from a previous
+        # test's cache
+        _get_active_template.cache_clear()
+
         self.customer = Customer.objects.create(
             name='Test Customer',
             email='test@example.com',
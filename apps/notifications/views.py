@@ -115,10 +115,15 @@ class SendBulkNotificationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Queue notifications for sending
+        # Queue notifications for sending in batches: one broker round trip
+        # per 100 notifications, and batches fan out across workers
         notification_ids = [str(n.id) for n in notifications]
+        batch_size = 100
         try:
-            send_bulk_notifications_task.delay(notification_ids)
+            for start in range(0, len(notification_ids), batch_size):
+                send_bulk_notifications_task.delay(
+                    notification_ids[start:start + batch_size]
+                )
         except Exception as e:
             logger.error(f"Failed to queue bulk notifications: {str(e)}")
             return Response(
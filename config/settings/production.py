@@ -20,14 +20,17 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 # Database connection pooling
 DATABASES['default']['CONN_MAX_AGE'] = 600
 
-# Logging for production
-LOGGING['handlers']['file']['class'] = 'logging.handlers.RotatingFileHandler'
+# Logging for production. ConcurrentRotatingFileHandler serializes writes
+# and rotation across gunicorn workers with fcntl locks; the stdlib
+# RotatingFileHandler's in-process lock lets workers truncate each other's
+# logs during rotation.
+LOGGING['handlers']['file']['class'] = 'concurrent_log_handler.ConcurrentRotatingFileHandler'
 LOGGING['handlers']['file']['maxBytes'] = 1024 * 1024 * 10  # 10MB
 LOGGING['handlers']['file']['backupCount'] = 5
 
 # Cache configuration for production
 CACHES['default']['TIMEOUT'] = 3600  # 1 hour
-CACHES['default']['OPTIONS']['CONNECTION_POOL_KWARGS']['max_connections'] = 100
+# Pool size comes from REDIS_MAX_CONNECTIONS (see core.redis_pool)
 
 # Email configuration for production
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
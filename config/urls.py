@@ -13,9 +13,14 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+# Browsers request /favicon.ico constantly; reuse one empty 204 instead of
+# allocating a response per hit. Safe to share: it has no body and the
+# header mutations middleware applies are the same on every request.
+_FAVICON_RESPONSE = HttpResponse(status=204)  # No Content
+
 def favicon_view(request):
     """Simple favicon handler"""
-    return HttpResponse(status=204)  # No Content
+    return _FAVICON_RESPONSE
 
 urlpatterns = [
     # Admin
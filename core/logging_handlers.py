@@ -0,0 +1,47 @@
+"""
+Asynchronous logging handlers for the notification system.
+"""
+import atexit
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class AsyncQueueHandler(QueueHandler):
+    """Queue-backed handler that flushes records on a background thread.
+
+    The request thread only enqueues the record onto a lock-free
+    SimpleQueue; the wrapped handlers (console/file) do their blocking
+    write() calls on the listener thread, so request handling is never
+    serialized behind the handler lock.
+    """
+
+    def __init__(self, handlers):
+        super().__init__(queue.SimpleQueue())
+        # dictConfig hands us a ConvertingList; indexing resolves the
+        # cfg:// references into real handler instances
+        self.handlers = [handlers[i] for i in range(len(handlers))]
+        self._start_listener()
+        atexit.register(self._stop_listener)
+        # The listener thread does not survive fork(). Celery's prefork
+        # pool forks workers after Django configures logging, so without
+        # this hook every child would enqueue records into a queue that
+        # nothing drains - task logs lost and the queue growing unboundedly
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._restart_in_child)
+
+    def _start_listener(self):
+        self.listener = QueueListener(
+            self.queue, *self.handlers, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def _stop_listener(self):
+        self.listener.stop()
+
+    def _restart_in_child(self):
+        # Records enqueued before the fork belong to the parent's
+        # listener; start this process with a fresh queue and its own
+        # listener thread
+        self.queue = queue.SimpleQueue()
+        self._start_listener()
@@ -0,0 +1,21 @@
+"""
+Shared helpers for the middleware stack.
+"""
+
+
+def get_client_ip(request):
+    """Get the client's IP address, memoized on the request.
+
+    partition() stops at the first comma instead of splitting the whole
+    X-Forwarded-For chain into a list; the result is cached on the request
+    so stacked middlewares compute it once.
+    """
+    ip = getattr(request, '_cached_client_ip', None)
+    if ip is None:
+        forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded_for:
+            ip = forwarded_for.partition(',')[0].strip()
+        else:
+            ip = request.META.get('REMOTE_ADDR', 'unknown')
+        request._cached_client_ip = ip
+    return ip
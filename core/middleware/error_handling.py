@@ -3,46 +3,82 @@ Error handling middleware for the notification system.
 """
 import logging
 import traceback
-from django.http import JsonResponse
-from django.utils.deprecation import MiddlewareMixin
+import orjson
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
 from rest_framework import status
 
 logger = logging.getLogger(__name__)
 
+# Outside DEBUG the 500 body is constant; serialize it once at import
+_ERROR_500_BODY = orjson.dumps({
+    'error': {
+        'message': 'An internal server error occurred',
+        'type': 'internal_server_error',
+        'code': 500
+    }
+})
 
-class ErrorHandlingMiddleware(MiddlewareMixin):
+
+class ErrorHandlingMiddleware:
     """Middleware for centralized error handling."""
-    
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    # Kept sync: it only logs and builds a response, and it runs on the
+    # cold exception path, so the sync_to_async adaptation under ASGI
+    # costs nothing in the common case.
     def process_exception(self, request, exception):
         """Handle exceptions and return appropriate JSON responses."""
+        # exc_info defers traceback formatting to the handler, so the stack
+        # is only walked if a handler actually emits the record
         logger.error(
-            f"Unhandled exception in {request.path}: {str(exception)}\n"
-            f"Traceback: {traceback.format_exc()}"
+            "Unhandled exception in %s: %s", request.path, exception,
+            exc_info=True,
         )
-        
+
         # Don't handle exceptions in debug mode - let Django handle them
         if hasattr(request, 'resolver_match') and request.resolver_match:
             if 'admin' in request.resolver_match.app_names:
                 return None
-        
+
         # Return JSON error response for API endpoints
         if request.path.startswith('/api/'):
-            error_response = {
-                'error': {
-                    'message': 'An internal server error occurred',
-                    'type': 'internal_server_error',
-                    'code': 500
-                }
-            }
-            
-            # Add more specific error information in debug mode
-            if hasattr(request, 'debug') and request.debug:
-                error_response['error']['details'] = str(exception)
-                error_response['error']['traceback'] = traceback.format_exc()
-            
-            return JsonResponse(
-                error_response,
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            # Only debug mode builds a fresh body with exception details;
+            # request.debug was checked before, which Django never sets,
+            # so the details branch never fired
+            if settings.DEBUG:
+                body = orjson.dumps({
+                    'error': {
+                        'message': 'An internal server error occurred',
+                        'type': 'internal_server_error',
+                        'code': 500,
+                        'details': str(exception),
+                        'traceback': traceback.format_exc(),
+                    }
+                })
+            else:
+                body = _ERROR_500_BODY
+
+            return HttpResponse(
+                body,
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content_type='application/json'
             )
-        
+
         return None
@@ -1,58 +1,83 @@
 """
 Request logging middleware for the notification system.
 """
+import re
 import time
 import logging
-import json
-from django.utils.deprecation import MiddlewareMixin
+import orjson
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import SynchronousOnlyOperation
+
+from ._util import get_client_ip
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import - matched on every request and response
+_API_PATH_RE = re.compile(r'^/api/')
+
+# Redacts sensitive JSON string values in the raw body preview without
+# parsing the body. The value part skips escaped quotes and the closing
+# quote is optional, so a secret cut off by the 512-byte truncation or
+# containing \" is still caught rather than logged verbatim
+_SECRET_RE = re.compile(r'"(password|token|secret|key)"\s*:\s*"(?:\\.|[^"\\])*"?')
+
 
-class RequestLoggingMiddleware(MiddlewareMixin):
+class RequestLoggingMiddleware:
     """Middleware for logging API requests and responses."""
-    
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
-        super().__init__(get_response)
-    
-    def process_request(self, request):
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self._log_request(request)
+        response = self.get_response(request)
+        return self._log_response(request, response)
+
+    async def __acall__(self, request):
+        self._log_request(request)
+        response = await self.get_response(request)
+        return self._log_response(request, response)
+
+    def _log_request(self, request):
         """Log incoming request details."""
         # Only log API requests
-        if request.path.startswith('/api/'):
+        if _API_PATH_RE.match(request.path):
             request.start_time = time.time()
-            
+
             # Log request details
             log_data = {
                 'method': request.method,
                 'path': request.path,
-                'user': str(request.user) if hasattr(request, 'user') else 'Anonymous',
-                'ip': self._get_client_ip(request),
+                'user': self._get_user_repr(request),
+                'ip': get_client_ip(request),
                 'user_agent': request.META.get('HTTP_USER_AGENT', ''),
                 'content_type': request.META.get('CONTENT_TYPE', ''),
             }
-            
-            # Log request body for non-GET requests (but exclude sensitive data)
-            if request.method != 'GET' and hasattr(request, 'body'):
-                try:
-                    body = json.loads(request.body.decode('utf-8'))
-                    # Remove sensitive fields
-                    sensitive_fields = ['password', 'token', 'secret', 'key']
-                    for field in sensitive_fields:
-                        if field in body:
-                            body[field] = '[REDACTED]'
-                    log_data['body'] = body
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    log_data['body'] = '[NON_JSON_BODY]'
-            
-            logger.info(f"Incoming request: {json.dumps(log_data)}")
-    
-    def process_response(self, request, response):
+
+            # Log a truncated raw body preview for non-GET requests, and only
+            # at DEBUG level - parsing the full body here duplicates the work
+            # DRF does anyway and reads large uploads just to log them
+            if (request.method != 'GET'
+                    and logger.isEnabledFor(logging.DEBUG)
+                    and hasattr(request, 'body')):
+                preview = request.body[:512].decode('utf-8', 'replace')
+                log_data['body_preview'] = _SECRET_RE.sub(r'"\1":"[REDACTED]"', preview)
+
+            logger.info(f"Incoming request: {orjson.dumps(log_data).decode()}")
+
+    def _log_response(self, request, response):
         """Log response details."""
         # Only log API responses
-        if request.path.startswith('/api/') and hasattr(request, 'start_time'):
+        if _API_PATH_RE.match(request.path) and hasattr(request, 'start_time'):
             duration = time.time() - request.start_time
-            
+
             log_data = {
                 'method': request.method,
                 'path': request.path,
@@ -60,24 +85,28 @@ class RequestLoggingMiddleware(MiddlewareMixin):
                 'duration_ms': round(duration * 1000, 2),
                 'content_type': response.get('Content-Type', ''),
             }
-            
+
             # Log response size
             if hasattr(response, 'content'):
                 log_data['response_size'] = len(response.content)
-            
+
             # Determine log level based on status code
             if response.status_code >= 500:
-                logger.error(f"Response: {json.dumps(log_data)}")
+                logger.error(f"Response: {orjson.dumps(log_data).decode()}")
             elif response.status_code >= 400:
-                logger.warning(f"Response: {json.dumps(log_data)}")
+                logger.warning(f"Response: {orjson.dumps(log_data).decode()}")
             else:
-                logger.info(f"Response: {json.dumps(log_data)}")
-        
+                logger.info(f"Response: {orjson.dumps(log_data).decode()}")
+
         return response
-    
-    def _get_client_ip(self, request):
-        """Get the client's IP address."""
-        forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if forwarded_for:
-            return forwarded_for.split(',')[0].strip()
-        return request.META.get('REMOTE_ADDR', 'unknown')
+
+    def _get_user_repr(self, request):
+        """Stringify the request user without forcing a DB hit on the loop."""
+        if not hasattr(request, 'user'):
+            return 'Anonymous'
+        try:
+            return str(request.user)
+        except SynchronousOnlyOperation:
+            # Lazy user would need a sync DB query; API auth happens in DRF
+            # later anyway, so don't resolve it just for a log line
+            return '[UNRESOLVED]'
@@ -1,88 +1,235 @@
 """
 Rate limiting middleware for the notification system.
 """
+import re
 import time
 import hashlib
+from functools import lru_cache
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import SynchronousOnlyOperation
 from django.http import JsonResponse
-from django.utils.deprecation import MiddlewareMixin
+from django.urls import resolve, Resolver404
 from django.core.cache import cache
 from rest_framework import status
 import logging
 
+from ._util import get_client_ip
+
 logger = logging.getLogger(__name__)
 
+try:
+    from django_redis import get_redis_connection
+except ImportError:
+    get_redis_connection = None
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+# Atomic sliding window over a Redis sorted set: prune entries outside the
+# window, count, and admit+record in one EVAL, so concurrent workers cannot
+# admit requests past the limit and each check costs a single round trip.
+RATE_LIMIT_SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+if redis.call('ZCARD', key) >= limit then
+    return 1
+end
+redis.call('ZADD', key, now, ARGV[1])
+redis.call('EXPIRE', key, window)
+return 0
+"""
+
+
+# Compiled once at import; per-endpoint rules are prefix patterns scanned in
+# order so sub-paths pick up their endpoint's limit instead of the default
+_API_PATH_RE = re.compile(r'^/api/')
+_ENDPOINT_LIMIT_RULES = (
+    (re.compile(r'^/api/v1/notifications/send/'), {'requests': 10, 'window': 60}),  # 10 per minute
+)
+_DEFAULT_LIMIT = {'requests': 100, 'window': 3600}  # 100 per hour
+
+
+@lru_cache(maxsize=1024)
+def _resolve_limit(path):
+    """Resolve the rate-limit config for a path, memoized per unique path."""
+    for pattern, limit_config in _ENDPOINT_LIMIT_RULES:
+        if pattern.match(path):
+            return limit_config
+    return _DEFAULT_LIMIT
+
 
-class RateLimitMiddleware(MiddlewareMixin):
+@lru_cache(maxsize=4096)
+def _route_for_path(path):
+    """Map a concrete path to its URLconf route template.
+
+    Parameterized URLs (e.g. /api/v1/orders/<uuid>/) all collapse onto one
+    route, so they share a rate-limit bucket instead of minting a Redis key
+    per object id.
+    """
+    try:
+        return resolve(path).route
+    except Resolver404:
+        return path
+
+
+def _bucket_key(client_id, path):
+    """Fixed-size rate-limit key: blake2b over client id + route template."""
+    digest = hashlib.blake2b(
+        f"{client_id}|{_route_for_path(path)}".encode(), digest_size=8
+    ).hexdigest()
+    return f"rl:{digest}"
+
+
+class RateLimitMiddleware:
     """Middleware for API rate limiting."""
-    
+
+    sync_capable = True
+    async_capable = True
+
+    _limit_script = None
+    _async_limit_script = None
+
     def __init__(self, get_response):
         self.get_response = get_response
-        super().__init__(get_response)
-    
-    def process_request(self, request):
-        """Apply rate limiting to API requests."""
+        is_async = iscoroutinefunction(get_response)
+        if is_async:
+            markcoroutinefunction(self)
+            if redis_asyncio is not None and RateLimitMiddleware._async_limit_script is None:
+                try:
+                    client = redis_asyncio.Redis.from_url(
+                        settings.CACHES['default']['LOCATION']
+                    )
+                    RateLimitMiddleware._async_limit_script = client.register_script(
+                        RATE_LIMIT_SLIDING_WINDOW_LUA
+                    )
+                except Exception as e:
+                    logger.warning(f"Async Redis rate-limit script unavailable: {e}")
+        elif get_redis_connection is not None and RateLimitMiddleware._limit_script is None:
+            try:
+                connection = get_redis_connection('default')
+                RateLimitMiddleware._limit_script = connection.register_script(
+                    RATE_LIMIT_SLIDING_WINDOW_LUA
+                )
+            except Exception as e:
+                logger.warning(f"Redis rate-limit script unavailable, using cache fallback: {e}")
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         # Only apply rate limiting to API endpoints
-        if not request.path.startswith('/api/'):
-            return None
-        
-        # Get client identifier
-        client_id = self._get_client_identifier(request)
-        
-        # Check rate limit
-        if self._is_rate_limited(client_id, request):
-            return JsonResponse({
-                'error': {
-                    'message': 'Rate limit exceeded',
-                    'type': 'rate_limit_exceeded',
-                    'code': 429
-                }
-            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
-        
-        return None
-    
+        if _API_PATH_RE.match(request.path):
+            client_id = self._get_client_identifier(request)
+            if self._is_rate_limited(client_id, request):
+                return self._rate_limit_response()
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if _API_PATH_RE.match(request.path):
+            client_id = self._get_client_identifier(request)
+            if await self._ais_rate_limited(client_id, request):
+                return self._rate_limit_response()
+        return await self.get_response(request)
+
+    @staticmethod
+    def _rate_limit_response():
+        return JsonResponse({
+            'error': {
+                'message': 'Rate limit exceeded',
+                'type': 'rate_limit_exceeded',
+                'code': 429
+            }
+        }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+
     def _get_client_identifier(self, request):
         """Get unique identifier for the client."""
         # Use user ID if authenticated, otherwise use IP address
-        if request.user.is_authenticated:
-            return f"user_{request.user.id}"
-        
-        # Get IP address (handle proxy headers)
-        forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if forwarded_for:
-            ip = forwarded_for.split(',')[0].strip()
-        else:
-            ip = request.META.get('REMOTE_ADDR', 'unknown')
-        
-        return f"ip_{ip}"
-    
+        try:
+            if hasattr(request, 'user') and request.user.is_authenticated:
+                return f"user_{request.user.id}"
+        except SynchronousOnlyOperation:
+            # Resolving the lazy user needs a sync DB query; API clients
+            # authenticate in DRF later anyway, so bucket by IP instead
+            pass
+
+        # Fall back to the IP address (handles proxy headers)
+        return f"ip_{get_client_ip(request)}"
+
     def _is_rate_limited(self, client_id, request):
         """Check if client has exceeded rate limit."""
-        # Different limits for different endpoints
-        endpoint_limits = {
-            '/api/v1/notifications/send/': {'requests': 10, 'window': 60},  # 10 per minute
-            'default': {'requests': 100, 'window': 3600},  # 100 per hour
-        }
-        
         # Get limit for current endpoint
-        limit_config = endpoint_limits.get(request.path, endpoint_limits['default'])
-        
-        cache_key = f"rate_limit_{client_id}_{request.path}"
+        limit_config = _resolve_limit(request.path)
+
+        cache_key = _bucket_key(client_id, request.path)
+
+        # Preferred path: one atomic Redis round trip
+        if self._limit_script is not None:
+            try:
+                limited = self._limit_script(
+                    keys=[cache_key],
+                    args=[
+                        f"{time.time():.6f}",
+                        limit_config['window'],
+                        limit_config['requests'],
+                    ],
+                )
+                if limited:
+                    logger.warning(f"Rate limit exceeded for {client_id} on {request.path}")
+                return bool(limited)
+            except Exception as e:
+                logger.warning(f"Redis rate-limit script failed, using cache fallback: {e}")
+
+        return self._cache_window_limited(cache_key, limit_config, client_id, request.path)
+
+    async def _ais_rate_limited(self, client_id, request):
+        """Async variant of the rate-limit check for ASGI workers."""
+        limit_config = _resolve_limit(request.path)
+
+        cache_key = _bucket_key(client_id, request.path)
+
+        if self._async_limit_script is not None:
+            try:
+                limited = await self._async_limit_script(
+                    keys=[cache_key],
+                    args=[
+                        f"{time.time():.6f}",
+                        limit_config['window'],
+                        limit_config['requests'],
+                    ],
+                )
+                if limited:
+                    logger.warning(f"Rate limit exceeded for {client_id} on {request.path}")
+                return bool(limited)
+            except Exception as e:
+                logger.warning(f"Redis rate-limit script failed, using cache fallback: {e}")
+
+        return await sync_to_async(self._cache_window_limited, thread_sensitive=False)(
+            cache_key, limit_config, client_id, request.path
+        )
+
+    def _cache_window_limited(self, cache_key, limit_config, client_id, path):
+        """Fallback: non-atomic window tracked through the cache API."""
         current_time = int(time.time())
         window_start = current_time - limit_config['window']
-        
+
         # Get current request count
         requests = cache.get(cache_key, [])
-        
+
         # Remove old requests outside the window
         requests = [req_time for req_time in requests if req_time > window_start]
-        
+
         # Check if limit exceeded
         if len(requests) >= limit_config['requests']:
-            logger.warning(f"Rate limit exceeded for {client_id} on {request.path}")
+            logger.warning(f"Rate limit exceeded for {client_id} on {path}")
             return True
-        
+
         # Add current request and update cache
         requests.append(current_time)
         cache.set(cache_key, requests, limit_config['window'])
-        
+
         return False
@@ -1,7 +1,10 @@
 """
 Factory pattern implementations for the notification system.
 """
+import time
+import threading
 from abc import ABC, abstractmethod
+from weakref import WeakSet
 from typing import Dict, Type, Optional
 import logging
 
@@ -24,21 +27,35 @@ class NotificationChannel(ABC):
 
 class NotificationChannelFactory:
     """Factory for creating notification channel instances."""
-    
+
     _channels: Dict[str, Type[NotificationChannel]] = {}
-    
+    _instances: Dict[str, NotificationChannel] = {}
+
     @classmethod
     def register_channel(cls, channel_type: str, channel_class: Type[NotificationChannel]):
         """Register a notification channel."""
-        cls._channels[channel_type.lower()] = channel_class
+        key = channel_type.lower()
+        cls._channels[key] = channel_class
+        cls._instances.pop(key, None)
         logger.info(f"Registered notification channel: {channel_type}")
-    
+
     @classmethod
     def create_channel(cls, channel_type: str) -> Optional[NotificationChannel]:
-        """Create a notification channel instance."""
-        channel_class = cls._channels.get(channel_type.lower())
+        """Return the channel instance for a type, building it on first use.
+
+        Channels are stateless apart from their circuit breaker, so one
+        instance per type is reused across sends; this also makes the
+        breaker actually accumulate failures instead of starting fresh
+        on every call.
+        """
+        key = channel_type.lower()
+        instance = cls._instances.get(key)
+        if instance is not None:
+            return instance
+        channel_class = cls._channels.get(key)
         if channel_class:
-            return channel_class()
+            instance = cls._instances[key] = channel_class()
+            return instance
         logger.error(f"Unknown notification channel: {channel_type}")
         return None
     
@@ -56,49 +73,66 @@ class CircuitBreakerState:
 
 
 class CircuitBreaker:
-    """Circuit breaker pattern implementation for fault tolerance."""
-    
+    """Circuit breaker pattern implementation for fault tolerance.
+
+    State lives in a single (state, failure_count, last_failure_time)
+    tuple that is swapped atomically, so the common CLOSED path is one
+    attribute load with no lock; the lock is only taken on transitions.
+    """
+
     def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = CircuitBreakerState.CLOSED
-    
+        self._lock = threading.Lock()
+        self._state = (CircuitBreakerState.CLOSED, 0, None)
+
+    @property
+    def state(self) -> str:
+        return self._state[0]
+
+    @property
+    def failure_count(self) -> int:
+        return self._state[1]
+
+    @property
+    def last_failure_time(self):
+        return self._state[2]
+
     def call(self, func, *args, **kwargs):
         """Execute function with circuit breaker protection."""
-        if self.state == CircuitBreakerState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitBreakerState.HALF_OPEN
+        state, _, last_failure = self._state
+        if state == CircuitBreakerState.OPEN:
+            if (time.time() - last_failure) >= self.recovery_timeout:
+                with self._lock:
+                    state, count, last_failure = self._state
+                    if state == CircuitBreakerState.OPEN:
+                        self._state = (CircuitBreakerState.HALF_OPEN, count, last_failure)
             else:
                 raise Exception("Circuit breaker is OPEN")
-        
+
         try:
             result = func(*args, **kwargs)
-            self._on_success()
-            return result
-        except Exception as e:
+        except Exception:
             self._on_failure()
-            raise e
-    
-    def _should_attempt_reset(self) -> bool:
-        """Check if circuit breaker should attempt reset."""
-        import time
-        return (time.time() - self.last_failure_time) >= self.recovery_timeout
-    
+            raise
+        self._on_success()
+        return result
+
     def _on_success(self):
         """Handle successful execution."""
-        self.failure_count = 0
-        self.state = CircuitBreakerState.CLOSED
-    
+        # Only swap (and lock) when there is actually something to reset
+        if self._state != (CircuitBreakerState.CLOSED, 0, None):
+            with self._lock:
+                self._state = (CircuitBreakerState.CLOSED, 0, None)
+
     def _on_failure(self):
         """Handle failed execution."""
-        import time
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.failure_count >= self.failure_threshold:
-            self.state = CircuitBreakerState.OPEN
+        with self._lock:
+            state, count, _ = self._state
+            count += 1
+            if count >= self.failure_threshold:
+                state = CircuitBreakerState.OPEN
+            self._state = (state, count, time.time())
 
 
 class StrategyPattern:
@@ -120,13 +154,23 @@ class StrategyPattern:
 
 
 class SingletonMeta(type):
-    """Singleton metaclass for ensuring single instance."""
+    """Singleton metaclass for ensuring single instance.
+
+    Uses double-checked locking: the lock is only taken on the first miss
+    per class, after which every call is a plain dict lookup.
+    """
     _instances = {}
-    
+    _lock = threading.Lock()
+
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super().__call__(*args, **kwargs)
-        return cls._instances[cls]
+        instance = cls._instances.get(cls)
+        if instance is None:
+            with SingletonMeta._lock:
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = super().__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
+        return instance
 
 
 class Observer(ABC):
@@ -139,19 +183,24 @@ class Observer(ABC):
 
 
 class Subject:
-    """Subject class for observer pattern."""
-    
+    """Subject class for observer pattern.
+
+    Observers are held in a WeakSet: detach is O(1) instead of a list
+    scan, and request-scoped observers are dropped automatically when
+    they go out of scope instead of leaking via the subject.
+    """
+
     def __init__(self):
-        self._observers = []
-    
+        self._observers = WeakSet()
+
     def attach(self, observer: Observer):
         """Attach an observer."""
-        self._observers.append(observer)
-    
+        self._observers.add(observer)
+
     def detach(self, observer: Observer):
         """Detach an observer."""
-        self._observers.remove(observer)
-    
+        self._observers.discard(observer)
+
     def notify(self, event_type: str, data: dict):
         """Notify all observers."""
         for observer in self._observers:
@@ -0,0 +1,25 @@
+"""
+Shared Redis connection pool for the notification system.
+"""
+import redis
+from decouple import config
+
+REDIS_URL = config('REDIS_URL', default='redis://127.0.0.1:6379/0')
+
+# One process-wide pool shared by the cache backend, sessions and the rate
+# limiter. BlockingConnectionPool caps total sockets per process and makes
+# callers wait (up to ``timeout`` seconds) for a free connection instead of
+# erroring out when the pool is exhausted.
+POOL = redis.BlockingConnectionPool.from_url(
+    REDIS_URL,
+    max_connections=config('REDIS_MAX_CONNECTIONS', default=100, cast=int),
+    timeout=2,
+)
+
+
+class SharedConnectionPool(redis.BlockingConnectionPool):
+    """Pool class for django_redis that always hands back the shared POOL."""
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        return POOL
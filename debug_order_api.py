@@ -6,10 +6,18 @@ Order API Testing and Debugging Guide
 This script will help you test the Order API and debug notification issues.
 """
 import os
+import sys
 import django
 import requests
 import json
 from datetime import datetime
+from string import Template
+
+# This script prints hundreds of short lines; switch stdout from
+# line-buffered to block-buffered so they coalesce into a few large
+# writes instead of one syscall per print()
+if hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
 
 # Setup Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
@@ -18,9 +26,42 @@ django.setup()
 from apps.orders.models import Order
 from apps.customers.models import Customer
 from django.contrib.auth.models import User
+from django.db import connection, transaction
 
 BASE_URL = "http://localhost:8000"
 
+# Curl command templates, parsed once at import. string.Template also
+# spares the doubled {{ }} escapes the old f-strings needed around the
+# JSON bodies.
+GET_ORDER_CURL = Template('''curl -X GET "$base/api/v1/orders/$oid/" \\
+  -H "Content-Type: application/json" \\
+  -H "Authorization: Token YOUR_TOKEN_HERE"
+''')
+
+UPDATE_STATUS_CURL = Template('''curl -X PUT "$base/api/v1/orders/$oid/status/" \\
+  -H "Content-Type: application/json" \\
+  -H "Authorization: Token YOUR_TOKEN_HERE" \\
+  -d '{"status": "delivered"}'
+''')
+
+PATCH_ORDER_CURL = Template('''curl -X PATCH "$base/api/v1/orders/$oid/" \\
+  -H "Content-Type: application/json" \\
+  -H "Authorization: Token YOUR_TOKEN_HERE" \\
+  -d '{"status": "shipped", "tracking_number": "TRACK123"}'
+''')
+
+CREATE_ORDER_CURL = Template('''curl -X POST "$base/api/v1/orders/" \\
+  -H "Content-Type: application/json" \\
+  -H "Authorization: Token YOUR_TOKEN_HERE" \\
+  -d '{
+    "order_number": "ORD-$timestamp",
+    "customer": "CUSTOMER_UUID_HERE",
+    "total_amount": "99.99",
+    "shipping_address": "123 Test St, Test City, TC 12345",
+    "status": "pending"
+  }'
+''')
+
 def check_database_status():
     """Check the current state of the database"""
     print("🔍 DATABASE STATUS")
@@ -34,16 +75,22 @@ def check_database_status():
         print(f"    Telegram: {customer.telegram_chat_id or 'Not set'}")
         print(f"    Phone: {customer.phone or 'Not set'}")
     
-    # Check orders
-    orders = Order.objects.all()
+    # Check orders - join the customer once and trim the column list so the
+    # loop below doesn't fire a SELECT per order for customer.name
+    orders = Order.objects.select_related('customer').only(
+        'id', 'order_number', 'status', 'total_amount', 'customer__name'
+    )
     print(f"\n📦 Orders: {orders.count()}")
-    for order in orders[:3]:
+    # Materialize the sample once; the caller reuses it without firing
+    # extra exists()/first() queries
+    sample_orders = list(orders[:3])
+    for order in sample_orders:
         print(f"  - Order #{order.order_number}: {order.status}")
         print(f"    Customer: {order.customer.name}")
         print(f"    Total: ${order.total_amount}")
         print(f"    ID: {order.id}")
-    
-    return orders
+
+    return sample_orders
 
 def check_order_api_endpoints():
     """Display available order API endpoints"""
@@ -135,43 +182,27 @@ def create_test_curl_commands(order_id=None):
     if order_id:
         print(f"🎯 Testing with Order ID: {order_id}")
         print()
-        
+
+        params = {'base': BASE_URL, 'oid': order_id}
+
         # Test order details
         print("📋 Get Order Details:")
-        print(f"""curl -X GET "{BASE_URL}/api/v1/orders/{order_id}/" \\
-  -H "Content-Type: application/json" \\
-  -H "Authorization: Token YOUR_TOKEN_HERE"
-""")
-        
+        print(GET_ORDER_CURL.substitute(params))
+
         # Test status update
         print("📦 Update Order Status (Triggers Notifications):")
-        print(f"""curl -X PUT "{BASE_URL}/api/v1/orders/{order_id}/status/" \\
-  -H "Content-Type: application/json" \\
-  -H "Authorization: Token YOUR_TOKEN_HERE" \\
-  -d '{{"status": "delivered"}}'
-""")
-        
+        print(UPDATE_STATUS_CURL.substitute(params))
+
         # Test full order update
         print("📝 Update Full Order (Triggers Notifications):")
-        print(f"""curl -X PATCH "{BASE_URL}/api/v1/orders/{order_id}/" \\
-  -H "Content-Type: application/json" \\
-  -H "Authorization: Token YOUR_TOKEN_HERE" \\
-  -d '{{"status": "shipped", "tracking_number": "TRACK123"}}'
-""")
-        
+        print(PATCH_ORDER_CURL.substitute(params))
+
     else:
         print("❌ No orders found. Create an order first:")
-        print(f"""curl -X POST "{BASE_URL}/api/v1/orders/" \\
-  -H "Content-Type: application/json" \\
-  -H "Authorization: Token YOUR_TOKEN_HERE" \\
-  -d '{{
-    "order_number": "ORD-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
-    "customer": "CUSTOMER_UUID_HERE",
-    "total_amount": "99.99",
-    "shipping_address": "123 Test St, Test City, TC 12345",
-    "status": "pending"
-  }}'
-""")
+        print(CREATE_ORDER_CURL.substitute(
+            base=BASE_URL,
+            timestamp=datetime.now().strftime('%Y%m%d-%H%M%S'),
+        ))
 
 def check_celery_tasks():
     """Show Celery task status"""
@@ -200,14 +231,21 @@ def check_environment_config():
     print("\n🔧 ENVIRONMENT CONFIG")
     print("=" * 50)
     
-    from decouple import config
-    
+    from decouple import Config, RepositoryEmpty, RepositoryEnv
+
+    # Parse .env once and answer every lookup from the in-memory dict
+    # instead of re-reading the file per config() call
+    if os.path.exists('.env'):
+        env = Config(RepositoryEnv('.env'))
+    else:
+        env = Config(RepositoryEmpty())  # falls back to os.environ
+
     configs = {
-        "TELEGRAM_BOT_TOKEN": config('TELEGRAM_BOT_TOKEN', default='Not set'),
-        "TELEGRAM_CHAT_ID": config('TELEGRAM_CHAT_ID', default='Not set'),
-        "EMAIL_HOST_USER": config('EMAIL_HOST_USER', default='Not set'),
-        "EMAIL_HOST_PASSWORD": config('EMAIL_HOST_PASSWORD', default='Not set'),
-        "REDIS_URL": config('REDIS_URL', default='redis://localhost:6379/0'),
+        "TELEGRAM_BOT_TOKEN": env('TELEGRAM_BOT_TOKEN', default='Not set'),
+        "TELEGRAM_CHAT_ID": env('TELEGRAM_CHAT_ID', default='Not set'),
+        "EMAIL_HOST_USER": env('EMAIL_HOST_USER', default='Not set'),
+        "EMAIL_HOST_PASSWORD": env('EMAIL_HOST_PASSWORD', default='Not set'),
+        "REDIS_URL": env('REDIS_URL', default='redis://localhost:6379/0'),
     }
     
     for key, value in configs.items():
@@ -223,17 +261,19 @@ def debug_notifications():
     
     from apps.notifications.models import NotificationTemplate, Notification
     
-    # Check templates
-    templates = NotificationTemplate.objects.all()
+    # Check templates - skip the large subject/body template columns and
+    # stream rows rather than caching the whole table on the queryset
+    templates = NotificationTemplate.objects.only('name', 'channel')
     print(f"📝 Notification Templates: {templates.count()}")
-    for template in templates:
+    for template in templates.iterator(chunk_size=2000):
         print(f"  - {template.name} ({template.channel})")
-    
-    # Check recent notifications
-    notifications = Notification.objects.all().order_by('-created_at')[:5]
+
+    # Check recent notifications - join the template so the loop doesn't
+    # fire one SELECT per row for template.name
+    notifications = Notification.objects.select_related('template').order_by('-created_at')[:5]
     print(f"\n📬 Recent Notifications: {notifications.count()}")
     for notif in notifications:
-        print(f"  - {notif.template_name} → {notif.recipient} ({notif.status})")
+        print(f"  - {notif.template.name} → {notif.recipient} ({notif.status})")
         print(f"    Created: {notif.created_at}")
 
 def main():
@@ -242,29 +282,34 @@ def main():
     print("=" * 60)
     print(f"🕐 Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
-    
-    # Check database
-    orders = check_database_status()
-    
-    # Show API endpoints
-    check_order_api_endpoints()
-    
-    # Show notification flow
-    show_notification_flow()
-    
-    # Generate test commands
-    first_order = orders.first() if orders.exists() else None
-    order_id = first_order.id if first_order else None
-    create_test_curl_commands(order_id)
-    
-    # Check Celery
-    check_celery_tasks()
-    
-    # Check environment
-    check_environment_config()
-    
-    # Debug notifications
-    debug_notifications()
+
+    # Warm one connection and run the whole read-only sweep in a single
+    # implicit transaction instead of paying connect+autocommit per query
+    connection.ensure_connection()
+    with transaction.atomic():
+        # Check database
+        orders = check_database_status()
+
+        # Show API endpoints
+        check_order_api_endpoints()
+
+        # Show notification flow
+        show_notification_flow()
+
+        # Generate test commands - orders is already a materialized list,
+        # so no extra exists()/first() queries here
+        first_order = orders[0] if orders else None
+        order_id = first_order.id if first_order else None
+        create_test_curl_commands(order_id)
+
+        # Check Celery
+        check_celery_tasks()
+
+        # Check environment
+        check_environment_config()
+
+        # Debug notifications
+        debug_notifications()
     
     print("\n🎯 NEXT STEPS:")
     print("=" * 50)
@@ -273,6 +318,7 @@ def main():
     print("3. ✅ Check Celery worker logs for task execution")
     print("4. ✅ Verify notifications are sent to Telegram and Email")
     print("5. ✅ Check notification records in database")
+    sys.stdout.flush()
 
 if __name__ == '__main__':
     main()
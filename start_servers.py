@@ -4,6 +4,7 @@ Starts both Django server and Celery worker.
 """
 import subprocess
 import sys
+import threading
 import time
 import os
 from pathlib import Path
@@ -32,18 +33,23 @@ def start_servers():
     
     try:
         print("\n🌐 Starting Django Development Server...")
+        # Children inherit our stdout/stderr: capturing to PIPE without
+        # draining eventually fills the ~64KB pipe buffer and deadlocks
+        # both servers under verbose logging
         django_process = subprocess.Popen([
             python_exe, "manage.py", "runserver", "0.0.0.0:8000"
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        ])
         
         print("   ✅ Django server starting...")
         time.sleep(3)  # Give Django time to start
         
         print("\n🐝 Starting Celery Worker...")
+        # Notification tasks are I/O-bound (SMTP, Telegram HTTP); the thread
+        # pool overlaps those waits, where --pool=solo serialized every send
         celery_process = subprocess.Popen([
-            python_exe, "-m", "celery", "-A", "config", "worker", 
-            "--loglevel=info", "--pool=solo"
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            python_exe, "-m", "celery", "-A", "config", "worker",
+            "--loglevel=info", "--pool=threads", "--concurrency=16"
+        ])
         
         print("   ✅ Celery worker starting...")
         time.sleep(2)
@@ -64,28 +70,26 @@ def start_servers():
         
         print("\n💡 Press Ctrl+C to stop both servers...")
         
-        # Keep the script running and monitor processes
-        try:
-            while True:
-                # Check if processes are still running
-                django_poll = django_process.poll()
-                celery_poll = celery_process.poll()
-                
-                if django_poll is not None:
-                    print(f"\n⚠️  Django server stopped (exit code: {django_poll})")
-                    break
-                    
-                if celery_poll is not None:
-                    print(f"\n⚠️  Celery worker stopped (exit code: {celery_poll})")
-                    break
-                
-                time.sleep(1)
-                
-        except KeyboardInterrupt:
-            print("\n\n🛑 Stopping servers...")
+        # Block until either child exits instead of polling at 1 Hz; a
+        # watcher thread per child wakes the main thread on exit
+        stopped = threading.Event()
+        exit_info = {}
+
+        def watch(process, name):
+            process.wait()
+            exit_info.setdefault(name, process.returncode)
+            stopped.set()
+
+        for process, name in (
+            (django_process, "Django server"),
+            (celery_process, "Celery worker"),
+        ):
+            threading.Thread(target=watch, args=(process, name), daemon=True).start()
+
+        def shutdown():
             django_process.terminate()
             celery_process.terminate()
-            
+
             # Wait for graceful shutdown
             try:
                 django_process.wait(timeout=5)
@@ -94,8 +98,22 @@ def start_servers():
                 print("   Force killing processes...")
                 django_process.kill()
                 celery_process.kill()
-            
+
             print("   ✅ Servers stopped.")
+
+        try:
+            stopped.wait()
+            for name, code in exit_info.items():
+                print(f"\n⚠️  {name} stopped (exit code: {code})")
+
+            # One child died - take the sibling down too rather than
+            # leaving it orphaned
+            print("\n🛑 Stopping remaining server...")
+            shutdown()
+
+        except KeyboardInterrupt:
+            print("\n\n🛑 Stopping servers...")
+            shutdown()
             
     except FileNotFoundError:
         print(f"❌ Error: Python executable not found at {python_exe}")
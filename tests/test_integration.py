@@ -13,14 +13,17 @@ from django.utils import timezone
 from apps.orders.models import Order
 from apps.customers.models import Customer
 from apps.notifications.models import Notification, NotificationTemplate, NotificationPreference
-from apps.notifications.services import NotificationService
+from apps.notifications.services import NotificationService, _get_active_template
 
 
 class NotificationIntegrationTest(TransactionTestCase):
     """Integration tests for the complete notification workflow."""
-    
+
     def setUp(self):
         """Set up test data."""
+        # Templates are recreated per test; drop any cached instances
+        _get_active_template.cache_clear()
+
         # Create test customer
         self.customer = Customer.objects.create(
             name='Integration Test Customer',
@@ -68,13 +71,16 @@ class NotificationIntegrationTest(TransactionTestCase):
             'new_status': 'SUCCESS'
         }
         
-        notification = service.create_notification(
-            template_name='order_update_email',
-            recipient='test@example.com',
-            customer=self.customer,
-            context=context
-        )
-        
+        # Lock in the query count so N+1 regressions break the build:
+        # one SELECT for the template (cold cache) plus the INSERT
+        with self.assertNumQueries(2):
+            notification = service.create_notification(
+                template_name='order_update_email',
+                recipient='test@example.com',
+                customer=self.customer,
+                context=context
+            )
+
         self.assertIsNotNone(notification)
         self.assertEqual(notification.subject, 'Order Update: TEST-001')
         self.assertIn('Integration Test Customer', notification.message)
@@ -86,3 +92,12 @@ class NotificationIntegrationTest(TransactionTestCase):
         self.assertNotIn('{{', notification.message)
         self.assertNotIn('}}', notification.subject)
         self.assertNotIn('}}', notification.message)
+
+        # A second call must hit the template cache: INSERT only
+        with self.assertNumQueries(1):
+            service.create_notification(
+                template_name='order_update_email',
+                recipient='test2@example.com',
+                customer=self.customer,
+                context=context
+            )